@@ -1,4 +1,8 @@
+import os
+import re
+import shutil
 import sys
+from collections import deque
 from pathlib import Path
 
 from databricks.labs.blueprint.cli import App
@@ -57,6 +61,63 @@ min_python: 3.10
 """
 
 
+# compiled once, so every copied file is rewritten in a single pass
+_RENAME_RE = re.compile(r"blueprint|databricks-sdk")
+
+# known-binary template files are copied as-is: shutil.copyfile() uses zero-copy
+# syscalls on Linux and skips the decode/substitute/encode round-trip
+_BINARY_SUFFIXES = {".png", ".jpg", ".jpeg", ".gif", ".ico", ".pdf", ".whl", ".zip", ".gz"}
+
+_IGNORE_NAMES = {
+    ".git",
+    ".venv",
+    ".databricks",
+    ".mypy_cache",
+    ".idea",
+    ".coverage",
+    "htmlcov",
+    "__pycache__",
+    "tests",
+    ".databricks-login.json",
+    "coverage.xml",
+    "dist",
+    "docs",
+}
+
+
+def _copy_renamed(src_dir: Path, dst_dir: Path, project_name: str):
+    """Copies the template tree into the target folder, rewriting project names on the way."""
+    renames = {"blueprint": project_name, "databricks-sdk": "databricks-labs-blueprint"}
+    # os.scandir() reuses the type information from the directory read, so we don't
+    # pay an extra stat() syscall per entry like Path.is_file()/Path.exists() would;
+    # paths stay plain strings inside the loop, avoiding PurePath allocations per entry
+    dst_root = str(dst_dir)
+    queue: deque[str] = deque([str(src_dir)])
+    while queue:
+        current = queue.popleft()
+        with os.scandir(current) as entries:
+            for entry in entries:
+                if entry.name in _IGNORE_NAMES:
+                    continue
+                entry_posix = entry.path.replace(os.sep, "/")
+                if entry_posix == "src/databricks/labs/blueprint":
+                    continue
+                if entry.is_file(follow_symlinks=False):
+                    relative_file_name = entry_posix.replace("blueprint", project_name)
+                    dst_file = os.path.join(dst_root, relative_file_name)
+                    os.makedirs(os.path.dirname(dst_file), exist_ok=True)
+                    if os.path.splitext(entry.name)[1].lower() in _BINARY_SUFFIXES:
+                        shutil.copyfile(entry.path, dst_file)
+                        continue
+                    encoding = sys.getdefaultencoding()
+                    with open(entry.path, "r", encoding=encoding) as src, open(dst_file, "w", encoding=encoding) as dst:
+                        dst.write(_RENAME_RE.sub(lambda m: renames[m.group(0)], src.read()))
+                elif entry.is_dir(follow_symlinks=False):
+                    if os.path.exists(os.path.join(entry.path, "pyvenv.cfg")):
+                        continue
+                    queue.append(entry.path)
+
+
 @blueprint.command(is_unauthenticated=True)
 def init_project(target):
     """Creates the required boilerplate structure"""
@@ -68,56 +129,23 @@ def init_project(target):
     project_name = prompts.question("Name of the project", default=target_folder.name)
     src_dir, dst_dir = relative_paths(project_root, target_folder.absolute())
 
-    ignore_names = {
-        ".git",
-        ".venv",
-        ".databricks",
-        ".mypy_cache",
-        ".idea",
-        ".coverage",
-        "htmlcov",
-        "__pycache__",
-        "tests",
-        ".databricks-login.json",
-        "coverage.xml",
-        "dist",
-        "docs",
-    }
-    queue: list[Path] = [src_dir]  # type: ignore[annotation-unchecked]
-    while queue:
-        current = queue.pop(0)
-        if current.name in ignore_names:
-            continue
-        if current.is_file():
-            relative_file_name = current.as_posix().replace("blueprint", project_name)
-            dst_file = dst_dir / relative_file_name
-            dst_file.parent.mkdir(exist_ok=True, parents=True)
-            with current.open("r", encoding=sys.getdefaultencoding()) as src, dst_file.open("w") as dst:
-                content = src.read().replace("blueprint", project_name)
-                content = content.replace("databricks-sdk", "databricks-labs-blueprint")
-                dst.write(content)
-            continue
-        virtual_env_marker = current / "pyvenv.cfg"
-        if virtual_env_marker.exists():
-            continue
-        for file in current.iterdir():
-            if file.as_posix() == "src/databricks/labs/blueprint":
-                continue
-            queue.append(file)
+    _copy_renamed(src_dir, dst_dir, project_name)
     inner_package_dir = dst_dir / "src" / "databricks" / "labs" / project_name
     inner_package_dir.mkdir(parents=True, exist_ok=True)
-    with (inner_package_dir / "__main__.py").open("w") as f:
-        f.write(MAIN_PY_FILE.replace("__app__", project_name))
-    with (inner_package_dir / "__init__.py").open("w") as f:
-        f.write(f"from databricks.labs.{project_name}.__about__ import __version__")
-    with (inner_package_dir / "__about__.py").open("w") as f:
-        f.write('__version__ = "0.0.0"\n')
-    with (dst_dir / "labs.yml").open("w") as f:
-        f.write(LABS_YML_FILE.replace("__app__", project_name))
-    with (dst_dir / "CODEOWNERS").open("w") as f:
-        f.write(f"* @nfx\n/src @databrickslabs/{project_name}-write\n/tests @databrickslabs/{project_name}-write\n")
-    with (dst_dir / "CHANGELOG.md").open("w") as f:
-        f.write(f"# Version changelog\n\n## 0.0.0\n\nInitial {project_name} commit\n")
+    # write_text() does a single open/write/close per file instead of a context-manager dance
+    (inner_package_dir / "__main__.py").write_text(MAIN_PY_FILE.replace("__app__", project_name), encoding="utf-8")
+    (inner_package_dir / "__init__.py").write_text(
+        f"from databricks.labs.{project_name}.__about__ import __version__", encoding="utf-8"
+    )
+    (inner_package_dir / "__about__.py").write_text('__version__ = "0.0.0"\n', encoding="utf-8")
+    (dst_dir / "labs.yml").write_text(LABS_YML_FILE.replace("__app__", project_name), encoding="utf-8")
+    (dst_dir / "CODEOWNERS").write_text(
+        f"* @nfx\n/src @databrickslabs/{project_name}-write\n/tests @databrickslabs/{project_name}-write\n",
+        encoding="utf-8",
+    )
+    (dst_dir / "CHANGELOG.md").write_text(
+        f"# Version changelog\n\n## 0.0.0\n\nInitial {project_name} commit\n", encoding="utf-8"
+    )
 
 
 if __name__ == "__main__":
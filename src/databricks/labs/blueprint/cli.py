@@ -2,11 +2,15 @@
 
 import functools
 import inspect
-import json
 import logging
-import types
+import typing
 from collections.abc import Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+try:  # optional: decodes command payloads a few times faster when installed
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
 
 from databricks.sdk import AccountClient, WorkspaceClient
 from databricks.sdk.config import with_user_agent_extra
@@ -15,44 +19,107 @@ from databricks.labs.blueprint.entrypoint import get_logger, run_main
 from databricks.labs.blueprint.tui import Prompts
 from databricks.labs.blueprint.wheels import ProductInfo
 
-
-@dataclass
+# flag values arrive as strings; anything else the handler declares is coerced
+# through a single dict hit instead of a match statement per flag
+_FLAG_COERCIONS: dict[str, Callable[[str], object]] = {
+    "int": int,
+    "float": float,
+    "bool": lambda value: value.lower() == "true",
+}
+
+# *args/**kwargs carry no flag names of their own, so they are skipped when
+# mapping kebab-case flags back to parameters
+_VARIADIC_KINDS = frozenset((inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD))
+
+# direct lookup avoids logging.getLevelName()'s dual int/str dispatch and tolerates
+# the CLI-only "disabled" and "trace" levels that the logging module doesn't know
+_LOG_LEVELS = {
+    "disabled": logging.INFO,
+    "trace": logging.DEBUG,
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warn": logging.WARNING,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+    "critical": logging.CRITICAL,
+}
+
+
+@dataclass(slots=True, frozen=True)
 class Command:
     name: str
     description: str
     fn: Callable[..., None]
     is_account: bool = False
     is_unauthenticated: bool = False
+    # computed once in __post_init__, so the hot path in _route is a slot read + dict lookup
+    arg_types: dict[str, str] = field(init=False, repr=False, compare=False)
+    prompts_arg: str | None = field(init=False, repr=False, compare=False)
+    needs_ws: bool = field(init=False, repr=False, compare=False)
+    needs_acct: bool = field(init=False, repr=False, compare=False)
+    flag_map: dict[str, str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # client construction does auth discovery and may hit the network, so only
+        # request one when the handler actually declares the argument;
+        # inspect.signature() follows __wrapped__, so decorated handlers keep their
+        # real parameter list, and the reflection cost is paid once at registration
+        parameters = inspect.signature(self.fn).parameters
+        arguments = [name for name, parameter in parameters.items() if parameter.kind not in _VARIADIC_KINDS]
+        # a **kwargs wrapper accepts whatever we pass, including the client
+        accepts_any = any(parameter.kind is inspect.Parameter.VAR_KEYWORD for parameter in parameters.values())
+        declares_ws = "w" in arguments or accepts_any
+        declares_acct = "a" in arguments or accepts_any
+        object.__setattr__(self, "needs_ws", not (self.is_account or self.is_unauthenticated) and declares_ws)
+        object.__setattr__(self, "needs_acct", self.is_account and declares_acct)
+        object.__setattr__(self, "flag_map", {name.replace("_", "-"): name for name in arguments})
+        # fn.__annotations__ is a plain dict that Python already materialized, so reading
+        # it skips the Signature/Parameter object construction done by inspect.signature()
+        annotations = self.fn.__annotations__
+        if any(isinstance(annotation, str) for annotation in annotations.values()):
+            # `from __future__ import annotations` stores strings: resolve them once
+            try:
+                annotations = typing.get_type_hints(self.fn)
+            except NameError:
+                # unresolvable forward references: nothing gets coerced
+                annotations = {}
+        arg_types = {}
+        prompts_arg = None
+        for name, annotation in annotations.items():
+            if name == "return":
+                continue
+            if annotation is Prompts and prompts_arg is None:
+                prompts_arg = name
+            if isinstance(annotation, type):
+                arg_types[name] = annotation.__name__
+            else:
+                arg_types[name] = str(annotation)
+        object.__setattr__(self, "arg_types", arg_types)
+        object.__setattr__(self, "prompts_arg", prompts_arg)
 
     def needs_workspace_client(self):
-        if self.is_unauthenticated:
-            return False
-        if self.is_account:
-            return False
-        return True
+        return self.needs_ws
 
     def prompts_argument_name(self) -> str | None:
-        sig = inspect.signature(self.fn)
-        for param in sig.parameters.values():
-            if param.annotation is Prompts:
-                return param.name
-        return None
+        return self.prompts_arg
 
     def get_argument_type(self, argument_name: str) -> str | None:
-        sig = inspect.signature(self.fn)
-        if argument_name not in sig.parameters:
-            return None
-        annotation = sig.parameters[argument_name].annotation
-        if isinstance(annotation, types.UnionType):
-            return str(annotation)
-        return annotation.__name__
+        return self.arg_types.get(argument_name)
 
 
 class App:
     def __init__(self, __file: str):
         self._mapping: dict[str, Command] = {}
-        self._logger = get_logger(__file)
-        self._product_info = ProductInfo(__file)
+        self.__file = __file
+
+    @functools.cached_property
+    def _logger(self):
+        return get_logger(self.__file)
+
+    @functools.cached_property
+    def _product_info(self):
+        # walks parent folders to find the project root, so only pay for it when needed
+        return ProductInfo(self.__file)
 
     def command(self, fn=None, is_account: bool = False, is_unauthenticated: bool = False):
         """Decorator to register a function as a command."""
@@ -77,47 +144,55 @@ class App:
 
     def _route(self, raw):
         """Route the command. This is the entry point for the CLI."""
-        payload = json.loads(raw)
+        payload = _json_loads(raw)
         command = payload["command"]
-        if command not in self._mapping:
+        cmd = self._mapping.get(command)
+        if cmd is None:
             msg = f"cannot find command: {command}"
             raise KeyError(msg)
         # user agent is set consistently with the Databricks CLI:
         # see https://github.com/databricks/cli/blob/main/cmd/root/user_agent_command.go#L35-L37
         with_user_agent_extra("cmd", command)
         flags = payload["flags"]
-        log_level = flags.pop("log_level")
-        if log_level == "disabled":
-            log_level = "info"
+        log_level = flags.pop("log_level").lower()
         databricks_logger = logging.getLogger("databricks")
-        databricks_logger.setLevel(log_level.upper())
-        kwargs = {k.replace("-", "_"): v for k, v in flags.items() if v != ""}
-        cmd = self._mapping[command]
-        # modify kwargs to match the type of the argument
-        for kwarg in list(kwargs.keys()):
-            match cmd.get_argument_type(kwarg):
-                case "int":
-                    kwargs[kwarg] = int(kwargs[kwarg])
-                case "bool":
-                    kwargs[kwarg] = kwargs[kwarg].lower() == "true"
-                case "float":
-                    kwargs[kwarg] = float(kwargs[kwarg])
+        databricks_logger.setLevel(_LOG_LEVELS.get(log_level, logging.INFO))
+        kwargs = self._command_kwargs(cmd, flags)
         try:
-            if cmd.needs_workspace_client():
+            if cmd.needs_ws:
                 kwargs["w"] = self._workspace_client()
-            elif cmd.is_account:
+            elif cmd.needs_acct:
                 kwargs["a"] = self._account_client()
-            prompts_argument = cmd.prompts_argument_name()
+            prompts_argument = cmd.prompts_arg
             if prompts_argument:
                 kwargs[prompts_argument] = Prompts()
             cmd.fn(**kwargs)
         except Exception as err:  # pylint: disable=broad-exception-caught
             logger = self._logger.getChild(command)
-            if log_level.lower() in {"debug", "trace"}:
+            if log_level in {"debug", "trace"}:
                 logger.error(f"Failed to call {command}", exc_info=err)
             else:
                 logger.error(f"{err.__class__.__name__}: {err}")
 
+    @staticmethod
+    def _command_kwargs(cmd: Command, flags: dict) -> dict:
+        """Builds handler kwargs in one pass: normalize the flag name, skip
+        empty values, and coerce to the declared type of the argument."""
+        arg_types = cmd.arg_types
+        flag_map = cmd.flag_map
+        kwargs = {}
+        for flag, value in flags.items():
+            if value == "":
+                continue
+            # known flags resolve via the precomputed map; anything else falls back to
+            # the string rewrite and surfaces as a TypeError when the command is called
+            kwarg = flag_map.get(flag)
+            if kwarg is None:
+                kwarg = flag.replace("-", "_")
+            coerce = _FLAG_COERCIONS.get(arg_types.get(kwarg, ""))
+            kwargs[kwarg] = coerce(value) if coerce else value
+        return kwargs
+
     def _account_client(self):
         return AccountClient(
             product=self._product_info.product_name(),
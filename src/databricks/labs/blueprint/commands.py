@@ -1,4 +1,5 @@
 import ast
+import functools
 import html
 import json
 import logging
@@ -9,6 +10,11 @@ import threading
 from collections.abc import Callable
 from typing import Any
 
+try:  # optional: decodes command results a few times faster when installed
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
 from databricks.sdk.core import DatabricksError
 from databricks.sdk.mixins.compute import ClustersExt
 from databricks.sdk.service import compute
@@ -16,8 +22,12 @@ from databricks.sdk.service import compute
 _out_re = re.compile(r"Out\[[\d\s]+]:\s")
 _tag_re = re.compile(r"<[^>]*>")
 _exception_re = re.compile(r".*Exception:\s+(.*)")
-_execution_error_re = re.compile(r"ExecutionError: ([\s\S]*)\n(StatusCode=[0-9]*)\n(StatusDescription=.*)\n")
-_error_message_re = re.compile(r"ErrorMessage=(.+)\n")
+# one alternation scans the cause once instead of two sequential passes
+_cause_error_re = re.compile(
+    r"ExecutionError: (?P<execution_error>[\s\S]*)\n(?P<status_code>StatusCode=[0-9]*)\n"
+    r"(?P<status_description>StatusDescription=.*)\n"
+    r"|ErrorMessage=(?P<error_message>.+)\n"
+)
 _ascii_escape_re = re.compile(r"(\x9B|\x1B\[)[0-?]*[ -/]*[@-~]")
 _LOG = logging.getLogger("databricks.sdk")
 
@@ -42,6 +52,10 @@ class _ReturnToPrintJson(ast.NodeTransformer):
                 "dynamic conversion of return .. to print(json.dumps(..)) is only possible starting from Python 3.8"
             )
 
+        # fast path: nothing to rewrite at all, skip the AST round-trip
+        if "return" not in code:
+            return code, False
+
         # perform AST transformations for very repetitive tasks, like JSON serialization
         code_tree = ast.parse(code)
         transform = _ReturnToPrintJson()
@@ -101,10 +115,10 @@ class CommandExecutor:
         self._ctx: compute.ContextStatusResponse | None = None
 
     def run(self, code: str, *, result_as_json=False, detect_return=True) -> Any:
-        code = self._trim_leading_whitespace(code)
-
         if self._language == compute.Language.PYTHON and detect_return and not result_as_json:
-            code, result_as_json = _ReturnToPrintJson.transform(code)
+            code, result_as_json = self._prepare_code(code)
+        else:
+            code = self._trim_leading_whitespace(code)
 
         ctx = self._running_command_context()
         cluster_id = self._cluster_id_provider()
@@ -120,7 +134,7 @@ class CommandExecutor:
                 try:
                     # parse json from converted return statement
                     assert results.data is not None
-                    return json.loads(results.data)
+                    return _json_loads(results.data)
                 except json.JSONDecodeError as e:
                     _LOG.warning("cannot parse converted return statement. Just returning text", exc_info=e)
                     return results.data
@@ -137,16 +151,31 @@ class CommandExecutor:
             """
         )
 
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def _prepare_code(code: str) -> tuple[str, bool]:
+        """Trims and rewrites a Python snippet once per distinct source string.
+
+        Fixed snippets like the `install_notebook_library` template are re-sent
+        verbatim, so caching skips the ast.parse/ast.unparse round-trip on repeats."""
+        code = CommandExecutor._trim_leading_whitespace(code)
+        return _ReturnToPrintJson.transform(code)
+
     def _running_command_context(self) -> compute.ContextStatusResponse:
-        if self._ctx:
-            return self._ctx
+        # double-checked locking: read the attribute once into a local so the
+        # common already-initialized path is a single load with no lock dance
+        ctx = self._ctx
+        if ctx is not None:
+            return ctx
         with self._lock:
-            if self._ctx:
-                return self._ctx
+            ctx = self._ctx
+            if ctx is not None:
+                return ctx
             cluster_id = self._cluster_id_provider()
             self._clusters.ensure_cluster_is_running(cluster_id)
-            self._ctx = self._commands.create(cluster_id=cluster_id, language=self._language).result()
-        return self._ctx
+            ctx = self._commands.create(cluster_id=cluster_id, language=self._language).result()
+            self._ctx = ctx
+        return ctx
 
     @staticmethod
     def _is_failed(results: compute.Results) -> bool:
@@ -189,13 +218,17 @@ class CommandExecutor:
             summary = summary.rstrip(" ")
             return summary
 
-        execution_error_matches = _execution_error_re.findall(results_cause)
-        if len(execution_error_matches) == 1:
-            return "\n".join(execution_error_matches[0])
-
-        error_message_matches = _error_message_re.findall(results_cause)
-        if len(error_message_matches) == 1:
-            return error_message_matches[0]
+        execution_errors = []
+        error_messages = []
+        for match in _cause_error_re.finditer(results_cause):
+            if match["execution_error"] is not None:
+                execution_errors.append("\n".join(match.group("execution_error", "status_code", "status_description")))
+            else:
+                error_messages.append(match["error_message"])
+        if len(execution_errors) == 1:
+            return execution_errors[0]
+        if len(error_messages) == 1:
+            return error_messages[0]
 
         return summary
 
@@ -204,23 +237,12 @@ class CommandExecutor:
         """Removes leading whitespace, so that Python code blocks that
         are embedded into Python code still could be interpreted properly."""
         lines = command_str.replace("\t", "    ").split("\n")
-        leading_whitespace = sys.maxsize
         if lines[0] == "":
             lines = lines[1:]
-        for line in lines:
-            pos = 0
-            for char in line:
-                if char in {" ", "\t"}:
-                    pos += 1
-                else:
-                    break
-            leading_whitespace = min(leading_whitespace, pos)
-        new_command = ""
-        for line in lines:
-            if line == "" or line.strip(" \t") == "":
-                continue
-            if len(line) < leading_whitespace:
-                new_command += line + "\n"
-            else:
-                new_command += line[leading_whitespace:] + "\n"
-        return new_command.strip()
+        # str.lstrip and min() are C-implemented, and blank lines don't count
+        # towards the common indent
+        content = [line for line in lines if line.strip(" \t")]
+        if not content:
+            return ""
+        leading_whitespace = min(len(line) - len(line.lstrip(" ")) for line in content)
+        return "\n".join(line[leading_whitespace:] for line in content).strip()
@@ -1,5 +1,6 @@
 """Entrypoint utilities for logging and project root detection"""
 
+import functools
 import logging
 import os
 import sys
@@ -7,6 +8,9 @@ from pathlib import Path
 
 from databricks.labs.blueprint.logger import install_logger
 
+# at most one of these matches, so stop scanning the string at the first hit
+_STRIPPED_SUFFIXES = ("/__main__.py", "/__init__.py", "/cli.py", ".py")
+
 
 def get_logger(__file: str):
     """Used as `get_logger(__file__)` to return a relevant logger for a file"""
@@ -15,10 +19,10 @@ def get_logger(__file: str):
 
     relative = entrypoint.relative_to(project_root).as_posix()
     relative = relative.removeprefix("src" + os.sep)
-    relative = relative.removesuffix("/__main__.py")
-    relative = relative.removesuffix("/__init__.py")
-    relative = relative.removesuffix("/cli.py")
-    relative = relative.removesuffix(".py")
+    for suffix in _STRIPPED_SUFFIXES:
+        if relative.endswith(suffix):
+            relative = relative[: -len(suffix)]
+            break
     module_name = relative.replace(os.sep, ".")
 
     logger = logging.getLogger(module_name)
@@ -41,8 +45,17 @@ def find_project_root(__file: str) -> Path:
     """Returns pathlib.Path for the nearest folder with pyproject.toml or setup.py file.
 
     Idiomatic usage is: find_project_root(__file__)
+
+    Results are memoized: every `get_logger(__file__)` and `ProductInfo(__file__)` in
+    a process repeats the same lookup, so repeat calls skip the filesystem probes.
+    The cache key is absolutized first, so relative paths stay correct across chdir.
     """
-    this_path = Path(__file)
+    return _find_project_root(os.path.abspath(__file))
+
+
+@functools.lru_cache(maxsize=None)
+def _find_project_root(absolute_file: str) -> Path:
+    this_path = Path(absolute_file)
     # TODO: detect when in wheel seems to be more challenging and pkgutil.get_data() might be necessary
     for leaf in ("pyproject.toml", "setup.py"):
         root = find_dir_with_leaf(this_path, leaf)
@@ -59,11 +72,15 @@ def find_dir_with_leaf(folder: Path, leaf: str) -> Path | None:
     :param leaf: str: name of the file or folder
 
     """
+    # make the path absolute once: the old loop re-ran folder.absolute() (and its
+    # getcwd() syscall) on every iteration just to detect the filesystem root
+    folder = folder.absolute()
     root = folder.root
-    while str(folder.absolute()) != root:
-        if (folder / leaf).exists():
-            return folder
-        folder = folder.parent
+    for candidate in (folder, *folder.parents):
+        if str(candidate) == root:
+            break
+        if (candidate / leaf).exists():
+            return candidate
     return None
 
 
@@ -80,9 +97,13 @@ def relative_paths(*maybe_paths) -> list[Path]:
     :param *maybe_paths: string-like arguments
 
     """
-    all_paths = [Path(str(_)).absolute() for _ in maybe_paths]
-    common_path = Path(os.path.commonpath([_.as_posix() for _ in all_paths]))
+    # operate on strings and only wrap the results in Path: os.path.abspath and
+    # os.path.commonpath are single C-level calls, while Path.absolute()/relative_to
+    # would allocate several intermediate path objects per argument
+    abs_paths = [os.path.abspath(str(_)) for _ in maybe_paths]
+    common_path = os.path.commonpath(abs_paths)
     # if common path is root, return absolute paths
-    if common_path.absolute().as_posix() == common_path.root:
-        return all_paths
-    return [_.relative_to(common_path) for _ in all_paths]
+    if common_path == os.sep:
+        return [Path(_) for _ in abs_paths]
+    prefix_len = len(common_path) + 1
+    return [Path(_[prefix_len:]) for _ in abs_paths]
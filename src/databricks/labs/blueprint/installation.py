@@ -9,10 +9,13 @@ import json
 import logging
 import os.path
 import re
+import sys
+import tempfile
 import threading
 import types
 import typing
-from collections.abc import Callable, Collection
+import weakref
+from collections.abc import Callable, Collection, Sequence
 from functools import partial
 from json import JSONDecodeError
 from pathlib import Path
@@ -26,9 +29,22 @@ from typing import (
     runtime_checkable,
 )
 
+# imported once at module load so the marshalling hot path doesn't re-execute
+# the import machinery per value
+# pylint: disable-next=import-private-name
+from typing import (  # type: ignore[attr-defined]  # isort: skip
+    _GenericAlias,
+    _UnionGenericAlias,
+)
+
+try:  # optional: 2-10x faster JSON encode/decode when installed
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
 import databricks.sdk.core
 from databricks.sdk import WorkspaceClient
-from databricks.sdk.errors import NotFound
+from databricks.sdk.errors import DatabricksError, NotFound
 from databricks.sdk.mixins import workspace
 from databricks.sdk.service.workspace import ImportFormat
 
@@ -38,6 +54,156 @@ logger = logging.getLogger(__name__)
 
 Json = dict[str, Any]
 
+# compiled once: _get_filename kebab-cases a class name on every save()/load()
+# without an explicit filename
+_KEBAB_RE = re.compile(r"(?<!^)(?=[A-Z])")
+
+
+@functools.lru_cache(maxsize=None)
+def _kebab_filename(class_name: str) -> str:
+    """Default filename for a class without an explicit one, e.g. `WorkspaceConfig` -> `workspace-config.json`.
+
+    Cached per class name: save()/load() loops re-derive the same handful of names."""
+    return f"{_KEBAB_RE.sub('-', class_name).lower()}.json"
+
+
+# hoisted out of the dispatch hot path: the inline tuple literals would be
+# rebuilt on every (un)marshal call, and frozenset membership is a hash probe
+_CONTAINER_ORIGINS = frozenset((dict, list))
+_UNION_TYPES = (types.UnionType, _UnionGenericAlias)
+_GENERIC_TYPES = (_GenericAlias, types.GenericAlias)
+
+# one SCIM /Me round-trip per client: current(), existing() and every cold
+# install_folder() resolve the same user name; weak keys don't pin the client
+_user_names: "weakref.WeakKeyDictionary[WorkspaceClient, str]" = weakref.WeakKeyDictionary()
+
+
+def _needs_resolution(hint) -> bool:
+    """Whether a hint contains an unresolved name anywhere in its tree, e.g. a PEP 563
+    string or the `ForwardRef`/plain-string argument of `list["Node"] | None`."""
+    if isinstance(hint, (str, typing.ForwardRef)):
+        return True
+    return any(_needs_resolution(arg) for arg in get_args(hint))
+
+
+@functools.lru_cache(maxsize=None)
+def _dataclass_field_hints(type_ref: type) -> tuple[tuple[str, type], ...]:
+    """Resolved `(field, hint)` pairs for a dataclass, with `ClassVar` fields filtered out.
+
+    `get_type_hints` re-parses annotations and resolves forward references on every
+    call, so the result is memoized: marshalling a list of dataclass instances pays
+    the reflection cost once per class instead of once per instance."""
+    if dataclasses.is_dataclass(type_ref):
+        # dataclasses.fields() already excludes ClassVar and InitVar pseudo-fields,
+        # and unless the module defers annotations (PEP 563) or a hint embeds a
+        # forward reference, each Field.type is the usable annotation object itself
+        fields = dataclasses.fields(type_ref)
+        if not any(_needs_resolution(field.type) for field in fields):
+            return tuple((field.name, field.type) for field in fields)
+    pairs = []
+    for field, hint in get_type_hints(type_ref).items():
+        if getattr(hint, "__origin__", None) is typing.ClassVar:
+            continue
+        pairs.append((field, hint))
+    return tuple(pairs)
+
+
+@functools.lru_cache(maxsize=None)
+def _dataclass_field_plan(
+    type_ref: type,
+) -> tuple[tuple[tuple[str, type, bool, Any, Any], ...], dict[str, type]]:
+    """Per-class unmarshalling plan: `(field, hint, has_default, default, default_factory)`
+    entries plus a field-name index of the hints.
+
+    Resolving defaults costs an attribute lookup and two `MISSING` sentinel
+    comparisons per field of every record; doing it once per class leaves the
+    per-record loop with plain tuple reads and dict hits."""
+    fields = getattr(type_ref, "__dataclass_fields__")
+    plan = []
+    hints = {}
+    for field, hint in _dataclass_field_hints(type_ref):
+        # interned names take the pointer-equality fast path when probing the
+        # JSON dict and the **kwargs dict of the constructor call
+        field = sys.intern(field)
+        has_default = False
+        default = None
+        default_factory = None
+        spec = fields.get(field)
+        if spec is not None:
+            if spec.default is not dataclasses.MISSING:
+                has_default = True
+                default = spec.default
+            elif spec.default_factory is not dataclasses.MISSING:
+                has_default = True
+                default_factory = spec.default_factory
+        plan.append((field, hint, has_default, default, default_factory))
+        hints[field] = hint
+    return tuple(plan), hints
+
+
+@functools.lru_cache(maxsize=None)
+def _union_required_keys(type_ref) -> tuple[tuple[frozenset[str], type], ...]:
+    """Required-key sets for a union's dataclass variants, used as discriminators."""
+    table = []
+    for variant in get_args(type_ref):
+        if not dataclasses.is_dataclass(variant):
+            continue
+        required = frozenset(
+            field for field, _, has_default, _, _ in _dataclass_field_plan(variant)[0] if not has_default
+        )
+        table.append((required, variant))
+    return tuple(table)
+
+
+@functools.lru_cache(maxsize=None)
+def _csv_field_names(dataclass_ref: type) -> tuple[str, ...]:
+    """Ordered field names of a dataclass, resolved once per class for CSV headers."""
+    return tuple(spec.name for spec in dataclasses.fields(dataclass_ref))
+
+
+@functools.lru_cache(maxsize=None)
+def _union_has_none(type_ref) -> bool:
+    """Whether the union admits `None`, i.e. is an `Optional[...]`."""
+    return types.NoneType in get_args(type_ref)
+
+
+@functools.lru_cache(maxsize=None)
+def _union_variant_index(type_ref) -> dict[type, type]:
+    """Exact-type index of a union's plain-class variants.
+
+    A value whose type is itself a union member resolves via one dict hit
+    instead of try-and-discard recursion through every variant; subclasses
+    and parameterized variants still take the linear scan."""
+    return {variant: variant for variant in get_args(type_ref) if isinstance(variant, type)}
+
+
+@functools.lru_cache(maxsize=1024)
+def _origin_args(type_ref) -> tuple[Any, tuple[Any, ...]]:
+    """Cached `(origin, args)` of a parameterized hint: `get_args` rebuilds the
+    tuple on every call, and both run once per container on the recursion path."""
+    return getattr(type_ref, "__origin__", None), get_args(type_ref)
+
+
+# specialized converters keyed on the exact hint: falsy values pass through
+# unchanged and already-converted values skip the constructor call entirely
+_PRIMITIVE_FASTPATH: dict[type, Callable[[Any], Any]] = {
+    str: lambda x: x if not x or x.__class__ is str else str(x),
+    int: lambda x: x if not x or x.__class__ is int else int(x),
+    bool: lambda x: x if not x or x.__class__ is bool else bool(x),
+    float: lambda x: x if not x or x.__class__ is float else float(x),
+}
+
+
+@functools.lru_cache(maxsize=1024)
+def _has_as_dict(type_ref: type) -> bool:
+    """Whether instances of `type_ref` serialize themselves via `as_dict()`.
+
+    `hasattr` walks the full MRO and swallows exceptions for every value that
+    `_marshal` sees - including primitives, where the answer is always no - so
+    the probe is cached per type."""
+    return callable(getattr(type_ref, "as_dict", None))
+
+
 __all__ = ["Installation", "MockInstallation", "IllegalState", "NotInstalled", "SerdeError"]
 
 
@@ -66,7 +232,6 @@ class Installation:
     the expected format."""
 
     T = TypeVar("T")
-    _PRIMITIVES = (int, bool, float, str)
 
     def __init__(self, ws: WorkspaceClient, product: str, *, install_folder: str | None = None):
         """The `Installation` class constructor creates an `Installation` object for the given product in
@@ -75,6 +240,14 @@ class Installation:
         self._product = product
         self._install_folder = install_folder
         self._lock = threading.Lock()
+        # filenames that are known to be absent, so that repeated
+        # load_or_default() calls don't re-issue a failing download
+        self._missing: set[str] = set()
+        # deserialized objects keyed by (filename, type), validated against the
+        # file's modification timestamp so repeated load() calls cost one HEAD
+        # request
+        self._load_cache: dict[tuple[str, Any], tuple[Any, Any]] = {}
+        self._fs_enabled = False
 
     @classmethod
     def current(cls, ws: WorkspaceClient, product: str, *, assume_user: bool = False) -> "Installation":
@@ -86,13 +259,21 @@ class Installation:
         user_folder = cls._user_home_installation(ws, product)
         applications_folder = cls._global_installation(product)
         folders = [user_folder, applications_folder]
-        for candidate in folders:
+
+        def probe(candidate: str) -> str | None:
             try:
                 ws.workspace.get_status(candidate)
-                return cls(ws, product, install_folder=candidate)
+                return candidate
             except NotFound:
                 logger.debug(f"{product} is not installed at {candidate}")
-                continue
+                return None
+
+        # both probes fire concurrently: when the user folder misses - the
+        # common case for global installs - we don't pay a second round-trip
+        present = set(Threads.strict(f"finding {product} installation", [partial(probe, f) for f in folders]))
+        for candidate in folders:
+            if candidate in present:
+                return cls(ws, product, install_folder=candidate)
         if assume_user:
             return cls(ws, product, install_folder=user_folder)
         raise NotInstalled(f"Application not installed: {product}")
@@ -123,15 +304,38 @@ class Installation:
             except NotFound:
                 return None
 
+        try:
+            # a single /Users listing enumerates every home folder - users and
+            # service principals alike - in one round-trip instead of two paged
+            # SCIM enumerations
+            candidates = [f"{object_info.path}/.{product}" for object_info in ws.workspace.list("/Users")]
+        except DatabricksError as err:
+            logger.debug(f"Cannot list /Users, falling back to SCIM enumeration: {err}")
+            candidates = cls._scim_folders(ws, product)
         tasks = [functools.partial(check_folder, cls._global_installation(product))]
-        for user in ws.users.list(attributes="userName"):
-            service_principal_folder = f"/Users/{user.user_name}/.{product}"
-            tasks.append(functools.partial(check_folder, service_principal_folder))
-        for service_principal in ws.service_principals.list(attributes="applicationId"):
-            service_principal_folder = f"/Users/{service_principal.application_id}/.{product}"
-            tasks.append(functools.partial(check_folder, service_principal_folder))
+        for folder in candidates:
+            tasks.append(functools.partial(check_folder, folder))
         return Threads.strict(f"finding {product} installations", tasks)
 
+    @staticmethod
+    def _scim_folders(ws: WorkspaceClient, product: str) -> list[str]:
+        """Fallback for callers that cannot list /Users: enumerate principals
+        via SCIM, with the two paged listings running concurrently."""
+
+        def user_folders() -> list[str]:
+            return [f"/Users/{user.user_name}/.{product}" for user in ws.users.list(attributes="userName")]
+
+        def service_principal_folders() -> list[str]:
+            return [
+                f"/Users/{service_principal.application_id}/.{product}"
+                for service_principal in ws.service_principals.list(attributes="applicationId")
+            ]
+
+        folders: list[str] = []
+        for batch in Threads.strict(f"listing {product} principals", [user_folders, service_principal_folders]):
+            folders.extend(batch)
+        return folders
+
     @classmethod
     def load_local(cls, type_ref: type[T], file: Path) -> T:
         """Loads a typed file from the local file system."""
@@ -206,15 +410,29 @@ class Installation:
         raise an `IllegalState` exception."""
         filename = self._get_filename(filename, type_ref)
         logger.debug(f"Loading {type_ref.__name__} from {filename}")
+        modified_at = self._modified_at(filename)
+        # the same file can be loaded as different types, so the type is part
+        # of the cache key
+        cache_key = (filename, type_ref)
+        if modified_at is not None:
+            cached = self._load_cache.get(cache_key)
+            if cached is not None and cached[0] == modified_at:
+                return cached[1]
         as_dict = self._load_content(filename)
-        return self._unmarshal_type(as_dict, filename, type_ref)
+        inst = self._unmarshal_type(as_dict, filename, type_ref)
+        if modified_at is not None:
+            self._load_cache[cache_key] = (modified_at, inst)
+        return inst
 
     def load_or_default(self, type_ref: type[T]) -> T:
         """If the file is not found, the method will return a default instance of the `type_ref` class."""
+        filename = self._get_filename(None, type_ref)
+        if filename in self._missing:
+            return self._unmarshal_type({}, filename, type_ref)
         try:
             return self.load(type_ref)
         except NotFound:
-            filename = self._get_filename(None, type_ref)
+            self._missing.add(filename)
             return self._unmarshal_type({}, filename, type_ref)
 
     def save(self, inst: T, *, filename: str | None = None):
@@ -250,32 +468,65 @@ class Installation:
             raise SerdeError("missing value")
         type_ref = self._get_type_ref(inst)
         filename = self._get_filename(filename, type_ref)
+        self._missing.discard(filename)
+        # drop every cached type for this filename, not just type_ref
+        for key in [key for key in self._load_cache if key[0] == filename]:
+            del self._load_cache[key]
         version = None
         if hasattr(inst, "__version__"):
             version = getattr(inst, "__version__")
         as_dict, _ = self._marshal(type_ref, [], inst)
         if version:
-            as_dict["version"] = version
+            # a non-empty inst always marshals to a dict, pylint just can't
+            # see that through the dispatch table
+            as_dict["version"] = version  # pylint: disable=unsupported-assignment-operation
         self._overwrite_content(filename, as_dict, type_ref)
         return f"{self.install_folder()}/{filename}"
 
+    def save_many(self, insts: Sequence[T], *, filenames: Sequence[str] | None = None) -> list[str]:
+        """Saves several dataclass objects in one concurrent batch.
+
+        WorkspaceFS has no transactional multi-file write, so every object is still its own request, but issuing
+        them through a thread pool overlaps the round-trips instead of paying for them sequentially. When no
+        `filenames` are provided, each filename is derived from the object's class, same as in the `save` method."""
+        if filenames is not None and len(filenames) != len(insts):
+            raise ValueError(f"provide one filename per object: got {len(filenames)} for {len(insts)} objects")
+        # resolve the folder before fanning out, so that worker threads don't
+        # race on the lazily-cached user-home lookup
+        install_folder = self.install_folder()
+        resolved = []
+        tasks = []
+        for position, inst in enumerate(insts):
+            filename = self._get_filename(filenames[position] if filenames else None, self._get_type_ref(inst))
+            resolved.append(filename)
+            tasks.append(functools.partial(self.save, inst, filename=filename))
+        Threads.strict(f"saving {len(tasks)} objects to {install_folder}", tasks)
+        return [f"{install_folder}/{filename}" for filename in resolved]
+
     def upload(self, filename: str, raw: bytes):
         """The `upload` method uploads raw bytes to a file on WorkspaceFS with the given `filename`. This method is
         used to upload files that are not typed, i.e., they do not have a corresponding `type_ref` object."""
         with self._lock:
+            self._missing.discard(filename)
             dst = f"{self.install_folder()}/{filename}"
-            attempt = partial(self._ws.workspace.upload, dst, raw, format=ImportFormat.AUTO, overwrite=True)
-            try:
-                logger.debug(f"Uploading: {dst}")
-                attempt()
-            except NotFound as error:
-                if error.error_code == "FEATURE_DISABLED":
-                    self._enable_files_in_repos()
-                parent_folder = os.path.dirname(dst)
-                logger.debug(f"Creating missing folders: {parent_folder}")
-                self._ws.workspace.mkdirs(parent_folder)
-                attempt()
-            return self._strip_notebook_source_suffix(dst, raw)
+        # the network calls run outside the lock: uploads are idempotent
+        # (overwrite=True, mkdirs tolerates existing folders), and holding it
+        # here would serialize the concurrent uploads issued by save_many
+        # a memoryview keeps any slicing on the SDK's chunked upload path
+        # zero-copy, and unlike a stream it needs no rewind when the first
+        # attempt fails and we retry after mkdirs
+        attempt = partial(self._ws.workspace.upload, dst, memoryview(raw), format=ImportFormat.AUTO, overwrite=True)
+        try:
+            logger.debug(f"Uploading: {dst}")
+            attempt()
+        except NotFound as error:
+            if error.error_code == "FEATURE_DISABLED":
+                self._enable_files_in_repos()
+            parent_folder = os.path.dirname(dst)
+            logger.debug(f"Creating missing folders: {parent_folder}")
+            self._ws.workspace.mkdirs(parent_folder)
+            attempt()
+        return self._strip_notebook_source_suffix(dst, raw)
 
     _NOTEBOOK_MAGIC = {
         "py": b"# Databricks notebook source",
@@ -286,14 +537,15 @@ class Installation:
     @classmethod
     def _strip_notebook_source_suffix(cls, dst: str, raw: bytes) -> str:
         """If the file is a Databricks notebook, the method will remove the suffix from the filename."""
-        if "." not in dst:
+        _, dot, ext = dst.rpartition(".")
+        if not dot:
             return dst
-        ext = dst.split(".")[-1]
         magic = cls._NOTEBOOK_MAGIC.get(ext)
         if not magic:
             return dst
-        magic_len = len(magic)
-        if len(raw) > magic_len and raw[0:magic_len] == magic:
+        # startswith reads the prefix in place - no raw[0:n] slice copy, and
+        # it is False for inputs shorter than the magic
+        if raw.startswith(magic):
             return dst.removesuffix(f".{ext}")
         return dst
 
@@ -301,18 +553,20 @@ class Installation:
         """The `upload_dbfs` method uploads raw bytes to a file on DBFS (Databricks File System) with the given
         `filename`. This method is used to upload files to DBFS, which is a distributed file system that is integrated
         with Databricks."""
-        with self._lock:
-            dst = f"{self.install_folder()}/{filename}"
-            attempt = partial(self._ws.dbfs.upload, dst, raw, overwrite=True)
-            try:
-                logger.debug(f"Uploading to DBFS: {dst}")
-                attempt()
-            except NotFound:
-                parent_folder = os.path.dirname(dst)
-                logger.debug(f"Creating missing DBFS folders: {parent_folder}")
-                self._ws.dbfs.mkdirs(parent_folder)
-                attempt()
-            return dst
+        # like upload(), the network calls run unlocked: overwrite=True and
+        # mkdirs are idempotent, so concurrent uploads to distinct files
+        # don't need to serialize
+        dst = f"{self.install_folder()}/{filename}"
+        attempt = partial(self._ws.dbfs.upload, dst, raw, overwrite=True)
+        try:
+            logger.debug(f"Uploading to DBFS: {dst}")
+            attempt()
+        except NotFound:
+            parent_folder = os.path.dirname(dst)
+            logger.debug(f"Creating missing DBFS folders: {parent_folder}")
+            self._ws.dbfs.mkdirs(parent_folder)
+            attempt()
+        return dst
 
     def files(self) -> list[workspace.ObjectInfo]:
         """The `files` method returns a list of all files in the installation folder on WorkspaceFS.
@@ -348,16 +602,13 @@ class Installation:
 
         The `as_dict` argument is the dictionary representation of the object that is to be written to the file.
         The `type_ref` argument is the type of the object that is being saved."""
-        converters: dict[str, Callable[[Any, type], bytes]] = {
-            "json": self._dump_json,
-            "yml": self._dump_yaml,
-            "csv": self._dump_csv,
-        }
-        extension = filename.split(".")[-1]
-        if extension not in converters:
+        # rpartition returns a tuple without allocating a list like split() would
+        extension = filename.rpartition(".")[2]
+        converter = self._DUMP_CONVERTERS.get(extension)
+        if converter is None:
             raise KeyError(f"Unknown extension: {extension}")
         logger.debug(f"Converting {type_ref.__name__} into {extension.upper()} format")
-        raw = converters[extension](as_dict, type_ref)
+        raw = converter(as_dict, type_ref)
         self.upload(filename, raw)
 
     @staticmethod
@@ -377,29 +628,41 @@ class Installation:
             as_dict = cls._migrate_file_format(type_ref, expected_version, as_dict, filename)
         return cls._unmarshal(as_dict, [], type_ref)
 
+    def _modified_at(self, filename: str):
+        """The `_modified_at` method is a private method that returns the modification timestamp of a file on
+        WorkspaceFS. It validates the in-process cache in the `load` method: one cheap `get_status` round-trip
+        decides whether the download and unmarshalling can be skipped."""
+        object_info = self._ws.workspace.get_status(f"{self.install_folder()}/{filename}")
+        return object_info.modified_at
+
     def _load_content(self, filename: str) -> Json:
         """The `_load_content` method is a private method that is used to load the contents of a file from
         WorkspaceFS as a dictionary. This method is called by the `load` method."""
-        with self._lock:
-            # TODO: check how to make this fail fast during unit testing, otherwise
-            # this currently hangs with the real installation class and mocked workspace client
-            with self._ws.workspace.download(f"{self.install_folder()}/{filename}") as f:
-                return self._convert_content(filename, f)
+        # no lock: downloads don't mutate instance state, and holding one here
+        # serialized concurrent load() calls to distinct files
+        # TODO: check how to make this fail fast during unit testing, otherwise
+        # this currently hangs with the real installation class and mocked workspace client
+        with self._ws.workspace.download(f"{self.install_folder()}/{filename}") as f:
+            if isinstance(f, io.RawIOBase):
+                # batch the stream's small reads into 64 KiB syscalls while parsing
+                f = io.BufferedReader(f, buffer_size=64 * 1024)  # type: ignore[arg-type,assignment]
+            return self._convert_content(filename, f)
 
     @classmethod
     def _convert_content(cls, filename: str, raw: BinaryIO) -> Json:
         """The `_convert_content` method is a private method that is used to convert the raw bytes of a file to a
         dictionary. This method is called by the `_load_content` method."""
-        converters: dict[str, Callable[[BinaryIO], Any]] = {
-            "json": json.load,
-            "yml": cls._load_yaml,
-            "csv": cls._load_csv,
-        }
-        extension = filename.split(".")[-1]
-        if extension not in converters:
+        extension = filename.rpartition(".")[2]
+        converter = cls._LOAD_CONVERTERS.get(extension)
+        if converter is None:
             raise KeyError(f"Unknown extension: {extension}")
+        # empty files are common enough that raising and catching a decode
+        # error for them is measurable; a buffered peek settles it upfront
+        peek = getattr(raw, "peek", None)
+        if peek is not None and not peek(1):
+            return {}
         try:
-            return converters[extension](raw)
+            return converter(raw)
         except JSONDecodeError:
             return {}
 
@@ -420,8 +683,12 @@ class Installation:
     def _user_home_installation(ws: WorkspaceClient, product: str):
         """The `_user_home_installation` method is a private method that is used to determine the installation folder
         for the current user. This method is called by the `install_folder` method."""
-        me = ws.current_user.me()
-        return f"/Users/{me.user_name}/.{product}"
+        user_name = _user_names.get(ws)
+        if user_name is None:
+            user_name = ws.current_user.me().user_name
+            if user_name is not None:
+                _user_names[ws] = user_name
+        return f"/Users/{user_name}/.{product}"
 
     @staticmethod
     def _migrate_file_format(type_ref, expected_version, as_dict, filename):
@@ -447,8 +714,7 @@ class Installation:
         if not filename and hasattr(type_ref, "__file__"):
             return getattr(type_ref, "__file__")
         if not filename:
-            kebab_name = re.sub(r"(?<!^)(?=[A-Z])", "-", type_ref.__name__).lower()
-            filename = f"{kebab_name}.json"
+            filename = _kebab_filename(type_ref.__name__)
         return filename
 
     @classmethod
@@ -474,52 +740,57 @@ class Installation:
         a dictionary. This method is called by the `save` method."""
         if inst is None:
             return None, False
+        # primitive leaves dominate real payloads, so exact type references
+        # resolve via the dispatch table in one dict hit before any
+        # isinstance probing; only unknown cases walk the residual chain
+        dispatch = self._MARSHAL_DISPATCH.get(type_ref)
+        if dispatch is not None:
+            return dispatch(self, path, inst)
         if isinstance(inst, databricks.sdk.core.Config):
             return self._marshal_databricks_config(inst)
-        if hasattr(inst, "as_dict"):
+        inst_type: type = type(inst)
+        if _has_as_dict(inst_type):
             return inst.as_dict(), True
         if dataclasses.is_dataclass(type_ref):
             return self._marshal_dataclass(type_ref, path, inst)
-        if type_ref == list:
-            return self._marshal_list(type_ref, path, inst)
         if isinstance(type_ref, enum.EnumMeta):
             return self._marshal_enum(inst)
-        if type_ref == types.NoneType:
-            return inst, inst is None
-        if type_ref in self._PRIMITIVES:
-            return inst, True
         return self._marshal_generic_types(type_ref, path, inst)
 
     def _marshal_generic_types(self, type_ref: type, path: list[str], inst: Any) -> tuple[Any, bool]:
-        # pylint: disable-next=import-outside-toplevel,import-private-name
-        from typing import (  # type: ignore[attr-defined]
-            _GenericAlias,
-            _UnionGenericAlias,
-        )
-
-        if isinstance(type_ref, (types.UnionType, _UnionGenericAlias)):  # type: ignore[attr-defined]
+        if isinstance(type_ref, _UNION_TYPES):  # type: ignore[attr-defined]
             return self._marshal_union(type_ref, path, inst)
-        if isinstance(type_ref, (_GenericAlias, types.GenericAlias)):  # type: ignore[attr-defined]
-            if type_ref.__origin__ in (dict, list) or isinstance(type_ref, types.GenericAlias):
+        if isinstance(type_ref, _GENERIC_TYPES):  # type: ignore[attr-defined]
+            if type_ref.__origin__ in _CONTAINER_ORIGINS or isinstance(type_ref, types.GenericAlias):
                 return self._marshal_generic(type_ref, path, inst)
             return self._marshal_generic_alias(type_ref, inst)
-        raise SerdeError(f'{".".join(path)}: unknown: {inst}')
+        raise SerdeError(f'{".".join(str(_) for _ in path)}: unknown: {inst}')
 
     def _marshal_union(self, type_ref: type, path: list[str], inst: Any) -> tuple[Any, bool]:
         """The `_marshal_union` method is a private method that is used to serialize an object of type `type_ref` to
         a dictionary. This method is called by the `save` method."""
+        variant = _union_variant_index(type_ref).get(type(inst))
+        if variant is not None:
+            path.append(f"(as {variant})")
+            value, ok = self._marshal(variant, path, inst)
+            path.pop()
+            if ok:
+                return value, True
         combo = []
-        for variant in get_args(type_ref):
-            value, ok = self._marshal(variant, [*path, f"(as {variant})"], inst)
+        for candidate in _origin_args(type_ref)[1]:
+            path.append(f"(as {candidate})")
+            value, ok = self._marshal(candidate, path, inst)
             if ok:
+                path.pop()
                 return value, True
-            combo.append(self._explain_why(variant, [*path, f"(as {variant})"], inst))
-        raise SerdeError(f'{".".join(path)}: union: {" or ".join(combo)}')
+            combo.append(self._explain_why(candidate, path, inst))
+            path.pop()
+        raise SerdeError(f'{".".join(str(_) for _ in path)}: union: {" or ".join(combo)}')
 
     def _marshal_generic(self, type_ref: type, path: list[str], inst: Any) -> tuple[Any, bool]:
         """The `_marshal_generic` method is a private method that is used to serialize an object of type `type_ref`
         to a dictionary. This method is called by the `save` method."""
-        type_args = get_args(type_ref)
+        type_args = _origin_args(type_ref)[1]
         if not type_args:
             raise SerdeError(f"Missing type arguments: {type_args}")
         if len(type_args) == 2:
@@ -540,10 +811,14 @@ class Installation:
         as_list = []
         if not isinstance(inst, list):
             return None, False
+        # the path list is mutated in place: append before recursing, pop after,
+        # so the happy path allocates no throwaway copies
         for i, v in enumerate(inst):
-            value, ok = self._marshal(type_ref, [*path, f"{i}"], v)
+            path.append(f"{i}")
+            value, ok = self._marshal(type_ref, path, v)
             if not ok:
-                raise SerdeError(self._explain_why(type_ref, [*path, f"{i}"], v))
+                raise SerdeError(self._explain_why(type_ref, path, v))
+            path.pop()
             as_list.append(value)
         return as_list, True
 
@@ -554,9 +829,11 @@ class Installation:
             return None, False
         as_dict = {}
         for k, v in inst.items():
-            as_dict[k], ok = self._marshal(type_ref, [*path, k], v)
+            path.append(k)
+            as_dict[k], ok = self._marshal(type_ref, path, v)
             if not ok:
-                raise SerdeError(self._explain_why(type_ref, [*path, k], v))
+                raise SerdeError(self._explain_why(type_ref, path, v))
+            path.pop()
         return as_dict, True
 
     def _marshal_dataclass(self, type_ref: type, path: list[str], inst: Any) -> tuple[Any, bool]:
@@ -565,16 +842,15 @@ class Installation:
         if inst is None:
             return None, False
         as_dict = {}
-        for field, hint in get_type_hints(type_ref).items():
-            origin = getattr(hint, "__origin__", None)
-            if origin is typing.ClassVar:
-                continue
+        for field, hint in _dataclass_field_hints(type_ref):
             raw = getattr(inst, field)
             if not raw:
                 continue
-            value, ok = self._marshal(hint, [*path, field], raw)
+            path.append(field)
+            value, ok = self._marshal(hint, path, raw)
             if not ok:
-                raise SerdeError(self._explain_why(hint, [*path, field], raw))
+                raise SerdeError(self._explain_why(hint, path, raw))
+            path.pop()
             if not value:
                 continue
             as_dict[field] = value
@@ -602,6 +878,34 @@ class Installation:
             return None, False
         return inst.value, True
 
+    def _marshal_passthrough(self, _path, inst):
+        """Dispatch-table entry for leaf values that serialize as themselves."""
+        return inst, True
+
+    def _marshal_raw_list(self, path, inst):
+        """Dispatch-table entry for a bare `list` type reference."""
+        return self._marshal_list(list, path, inst)
+
+    def _marshal_none(self, _path, inst):
+        """Dispatch-table entry for `None`-typed fields."""
+        return inst, inst is None
+
+    def _marshal_config(self, _path, inst):
+        """Dispatch-table entry for `databricks.sdk.core.Config` values."""
+        return self._marshal_databricks_config(inst)
+
+    # maps exact type references to their marshaller, resolved at class-definition
+    # time so _marshal skips the isinstance ladder for the common leaf types
+    _MARSHAL_DISPATCH: dict[Any, Callable[["Installation", list[str], Any], tuple[Any, bool]]] = {
+        int: _marshal_passthrough,
+        bool: _marshal_passthrough,
+        float: _marshal_passthrough,
+        str: _marshal_passthrough,
+        list: _marshal_raw_list,
+        types.NoneType: _marshal_none,
+        databricks.sdk.core.Config: _marshal_config,
+    }
+
     @runtime_checkable
     class _FromDict(Protocol):
         """The `_FromDict` protocol is used to define a type that can be constructed from a dictionary. This protocol
@@ -616,14 +920,17 @@ class Installation:
     def _unmarshal(cls, inst: Any, path: list[str], type_ref: type[T]) -> T | None:
         """The `_unmarshal` method is a private method that is used to deserialize a dictionary to an object of type
         `type_ref`. This method is called by the `load` method."""
+        # primitive leaves dominate the recursion, so resolve them with one
+        # dict hit before the classification cascade below
+        fast = _PRIMITIVE_FASTPATH.get(type_ref)
+        if fast is not None:
+            return fast(inst)
         if dataclasses.is_dataclass(type_ref):
             return cls._unmarshal_dataclass(inst, path, type_ref)
         if isinstance(type_ref, enum.EnumMeta):
             if not inst:
                 return None
             return type_ref(inst)
-        if type_ref in cls._PRIMITIVES:
-            return cls._unmarshal_primitive(inst, type_ref)
         if type_ref == databricks.sdk.core.Config:
             if not inst:
                 inst = {}
@@ -636,17 +943,11 @@ class Installation:
 
     @classmethod
     def _unmarshal_generic_types(cls, type_ref, path, inst):
-        # pylint: disable-next=import-outside-toplevel,import-private-name
-        from typing import (  # type: ignore[attr-defined]
-            _GenericAlias,
-            _UnionGenericAlias,
-        )
-
-        if isinstance(type_ref, (types.UnionType, _UnionGenericAlias)):
+        if isinstance(type_ref, _UNION_TYPES):
             return cls._unmarshal_union(inst, path, type_ref)
-        if isinstance(type_ref, (_GenericAlias, types.GenericAlias)):
+        if isinstance(type_ref, _GENERIC_TYPES):
             return cls._unmarshal_generic(inst, path, type_ref)
-        raise SerdeError(f'{".".join(path)}: unknown: {type_ref}: {inst}')
+        raise SerdeError(f'{".".join(str(_) for _ in path)}: unknown: {type_ref}: {inst}')
 
     @classmethod
     def _unmarshal_dataclass(cls, inst, path, type_ref):
@@ -656,49 +957,74 @@ class Installation:
             return None
         if not isinstance(inst, dict):
             raise SerdeError(cls._explain_why(dict, path, inst))
+        plan, hints = _dataclass_field_plan(type_ref)
         from_dict = {}
-        fields = getattr(type_ref, "__dataclass_fields__")
-        for field_name, hint in get_type_hints(type_ref).items():
-            origin = getattr(hint, "__origin__", None)
-            if origin is typing.ClassVar:
+        # iterate the record's own keys once: with many optional fields the
+        # record usually carries far fewer keys than the class declares
+        for field_name, raw in inst.items():
+            hint = hints.get(field_name)
+            if hint is None:
+                continue
+            path.append(field_name)
+            value = cls._unmarshal(raw, path, hint)
+            path.pop()
+            if value is not None:
+                from_dict[field_name] = value
+        # second pass fills defaults for whatever the record did not provide
+        for field_name, hint, has_default, default_value, default_factory in plan:
+            if from_dict.get(field_name) is not None:
                 continue
-            raw = inst.get(field_name)
-            value = cls._unmarshal(raw, [*path, field_name], hint)
-            if value is None:
-                field = fields.get(field_name)
-                default_value = field.default
-                default_factory = field.default_factory
-                if default_factory == dataclasses.MISSING and default_value == dataclasses.MISSING:
-                    raise SerdeError(cls._explain_why(hint, [*path, field_name], value))
-                if default_value != dataclasses.MISSING:
-                    value = default_value
-                else:
-                    value = default_factory()
-            from_dict[field_name] = value
+            if not has_default:
+                path.append(field_name)
+                raise SerdeError(cls._explain_why(hint, path, None))
+            from_dict[field_name] = default_value if default_factory is None else default_factory()
         return type_ref(**from_dict)
 
     @classmethod
     def _unmarshal_union(cls, inst, path, type_ref):
         """The `_unmarshal_union` method is a private method that is used to deserialize a dictionary to an object
         of type `type_ref`. This method is called by the `load` method."""
-        for variant in get_args(type_ref):
+        if inst is None:
+            # Optional[X] is the overwhelmingly common union: a missing value
+            # resolves right away instead of probing every variant with None
+            if _union_has_none(type_ref):
+                return None
+        else:
+            value = cls._unmarshal_union_discriminated(inst, path, type_ref)
+            if value:
+                return value
+        for variant in _origin_args(type_ref)[1]:
             value = cls._unmarshal(inst, path, variant)
             if value:
                 return value
         return None
 
+    @classmethod
+    def _unmarshal_union_discriminated(cls, inst, path, type_ref):
+        """Resolves a union value by discriminator before the try-each fallback: a dict
+        matching exactly one variant's required keys, or a value whose exact type is a
+        plain-class variant."""
+        if isinstance(inst, dict):
+            # discriminate dataclass variants by their required keys, so an
+            # unambiguous record skips the speculative attempts on the others
+            matches = [variant for required, variant in _union_required_keys(type_ref) if required <= inst.keys()]
+            if len(matches) == 1:
+                return cls._unmarshal_dataclass(inst, path, matches[0])
+            return None
+        variant = _union_variant_index(type_ref).get(type(inst))
+        if variant is None:
+            return None
+        return cls._unmarshal(inst, path, variant)
+
     @classmethod
     def _unmarshal_generic(cls, inst, path, type_ref):
         """The `_unmarshal_generic` method is a private method that is used to deserialize a dictionary to an object
         of type `type_ref`. This method is called by the `load` method."""
-        # pylint: disable-next=import-outside-toplevel,import-private-name
-        from typing import _GenericAlias  # type: ignore[attr-defined]
-
-        type_args = get_args(type_ref)
+        origin, type_args = _origin_args(type_ref)
         if not type_args:
             raise SerdeError(f"Missing type arguments: {type_args}")
-        if type_ref.__origin__ not in (dict, list) and isinstance(type_ref, _GenericAlias):
-            return cls._unmarshal(inst, path, type_ref.__origin__)
+        if origin not in _CONTAINER_ORIGINS and isinstance(type_ref, _GenericAlias):
+            return cls._unmarshal(inst, path, origin)
         if inst is None:
             return None
         if len(type_args) == 2:
@@ -711,9 +1037,20 @@ class Installation:
         of type `type_ref`. This method is called by the `load` method."""
         if inst is None:
             return None
-        as_list = []
+        # preallocate the result and push raw indexes on the path: formatting
+        # the position into a string is deferred to the error path
+        as_list: list[Any] = [None] * len(inst)
+        # scalar leaves convert inline - no recursive frame and no path
+        # bookkeeping per element of the overwhelmingly common list[str] case
+        fast = _PRIMITIVE_FASTPATH.get(hint)
+        if fast is not None:
+            for i, v in enumerate(inst):
+                as_list[i] = fast(v)
+            return as_list
         for i, v in enumerate(inst):
-            as_list.append(cls._unmarshal(v, [*path, f"{i}"], hint))
+            path.append(i)
+            as_list[i] = cls._unmarshal(v, path, hint)
+            path.pop()
         return as_list
 
     @classmethod
@@ -724,33 +1061,42 @@ class Installation:
             return None
         if not isinstance(inst, dict):
             raise SerdeError(cls._explain_why(type_ref, path, inst))
+        fast = _PRIMITIVE_FASTPATH.get(type_ref)
+        if fast is not None:
+            return {k: fast(v) for k, v in inst.items()}
         from_dict = {}
         for k, v in inst.items():
-            from_dict[k] = cls._unmarshal(v, [*path, k], type_ref)
+            path.append(k)
+            from_dict[k] = cls._unmarshal(v, path, type_ref)
+            path.pop()
         return from_dict
 
-    @classmethod
-    def _unmarshal_primitive(cls, inst, type_ref):
-        """The `_unmarshal_primitive` method is a private method that is used to deserialize a dictionary to an object
-        of type `type_ref`. This method is called by the `load` method."""
-        if not inst:
-            return inst
-        # convert from str to int if necessary
-        converted = type_ref(inst)  # type: ignore[call-arg]
-        return converted
-
     @staticmethod
     def _explain_why(type_ref: type, path: list[str], raw: Any) -> str:
         """The `_explain_why` method is a private method that is used to explain why a value is not of the expected
         type. This method is called by the `_unmarshal` and `_marshal` methods."""
         if raw is None:
             raw = "value is missing"
-        return f'{".".join(path)}: not a {type_ref.__name__}: {raw}'
+        return f'{".".join(str(_) for _ in path)}: not a {type_ref.__name__}: {raw}'
+
+    @staticmethod
+    def _load_json(raw: BinaryIO) -> Json:
+        """The `_load_json` method is a private method that is used to deserialize a JSON stream to a dictionary.
+        This method is called by the `load` method."""
+        if orjson is not None:
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers
+            # catching the stdlib error keep working
+            return orjson.loads(raw.read())
+        return json.load(raw)
 
     @staticmethod
     def _dump_json(as_dict: Json, _: type) -> bytes:
         """The `_dump_json` method is a private method that is used to serialize a dictionary to a JSON string. This
         method is called by the `save` method."""
+        if orjson is not None:
+            # emits bytes directly, skipping the str round-trip and re-encode;
+            # OPT_NON_STR_KEYS stringifies e.g. int dict keys like stdlib json does
+            return orjson.dumps(as_dict, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
         return json.dumps(as_dict, indent=2).encode("utf8")
 
     @staticmethod
@@ -758,9 +1104,12 @@ class Installation:
         """The `_dump_yaml` method is a private method that is used to serialize a dictionary to a YAML string. This
         method is called by the `save` method."""
         try:
-            from yaml import dump  # pylint: disable=import-outside-toplevel
+            import yaml  # pylint: disable=import-outside-toplevel
 
-            return dump(raw).encode("utf8")
+            # the LibYAML C emitter is several times faster than the
+            # pure-Python one PyYAML falls back to
+            dumper = getattr(yaml, "CDumper", yaml.Dumper)
+            return yaml.dump(raw, Dumper=dumper).encode("utf8")
         except ImportError as err:
             raise SyntaxError("PyYAML is not installed. Fix: pip install databricks-labs-blueprint[yaml]") from err
 
@@ -769,14 +1118,15 @@ class Installation:
         """The `_load_yaml` method is a private method that is used to deserialize a YAML string to a dictionary. This
         method is called by the `load` method."""
         try:
-            from yaml import (  # pylint: disable=import-outside-toplevel
-                YAMLError,
-                safe_load,
-            )
+            import yaml  # pylint: disable=import-outside-toplevel
 
+            # LibYAML parses in C; safe_load() would pick the pure-Python loader
+            loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
             try:
-                return safe_load(raw)
-            except YAMLError as err:
+                loaded = yaml.load(raw, Loader=loader)
+                # a whitespace-only document parses to None, not an error
+                return {} if loaded is None else loaded
+            except yaml.YAMLError as err:
                 raise JSONDecodeError(str(err), "<yaml>", 0) from err
         except ImportError as err:
             raise SyntaxError("PyYAML is not installed. Fix: pip install databricks-labs-blueprint[yaml]") from err
@@ -785,41 +1135,65 @@ class Installation:
     def _dump_csv(raw: list[Json], type_ref: type) -> bytes:
         """The `_dump_csv` method is a private method that is used to serialize a list of dictionaries to a CSV string.
         This method is called by the `save` method."""
-        type_args = get_args(type_ref)
+        type_args = _origin_args(type_ref)[1]
         if not type_args:
             raise SerdeError(f"Writing CSV is only supported for lists. Got {type_ref}")
         dataclass_ref = type_args[0]
         if not dataclasses.is_dataclass(dataclass_ref):
             raise SerdeError(f"Only lists of dataclasses allowed. Got {dataclass_ref}")
-        non_empty_keys = set()
+        # one validation-plus-key-scan pass over the rows; writerows() below is
+        # the only other traversal and it loops in C
+        non_empty_keys: set[str] = set()
         for as_dict in raw:
             if not isinstance(as_dict, dict):
                 raise SerdeError(f"Expecting a list of dictionaries. Got {as_dict}")
-            for k, v in as_dict.items():
-                if not v:
-                    continue
-                non_empty_keys.add(k)
-        buffer = io.StringIO()
+            non_empty_keys |= {k for k, v in as_dict.items() if v}
+        # write through a text wrapper straight into bytes: StringIO plus a
+        # final encode() would copy the whole payload twice more
+        buffer = io.BytesIO()
+        text = io.TextIOWrapper(buffer, encoding="utf8", newline="", write_through=True)
         # get ordered field names the way they appear in dataclass
-        field_names = [_.name for _ in dataclasses.fields(dataclass_ref) if _.name in non_empty_keys]
-        writer = csv.DictWriter(buffer, field_names, dialect="excel")
-        writer.writeheader()
-        for as_dict in raw:
-            writer.writerow(as_dict)
-        buffer.seek(0)
-        return buffer.read().encode("utf8")
+        field_names = [name for name in _csv_field_names(dataclass_ref) if name in non_empty_keys]
+        # project the rows to plain lists once and emit them with the bare
+        # csv.writer: one C-level batch write, no per-row DictWriter dispatch;
+        # keys outside the header are the empty-valued ones and are dropped
+        writer = csv.writer(text, dialect="excel")
+        writer.writerow(field_names)
+        writer.writerows([[as_dict.get(name, "") for name in field_names] for as_dict in raw])
+        text.flush()
+        return buffer.getvalue()
 
     @staticmethod
     def _load_csv(raw: BinaryIO) -> list[Json]:
         with io.TextIOWrapper(raw, encoding="utf8") as text_file:
-            out = []
-            for row in csv.DictReader(text_file):  # type: ignore[arg-type]
-                out.append(row)
-            return out
+            # plain reader + dict(zip(...)) skips the per-row restkey/restval
+            # bookkeeping that DictReader does in Python
+            reader = csv.reader(text_file)
+            header = next(reader, None)
+            if header is None:
+                return []
+            return [dict(zip(header, row)) for row in reader]
+
+    # resolved once at class definition, so save()/load() don't rebuild a
+    # converters dict (and re-bind its methods) on every call
+    _LOAD_CONVERTERS: dict[str, Callable[[BinaryIO], Any]] = {
+        "json": _load_json,
+        "yml": _load_yaml,
+        "csv": _load_csv,
+    }
+    _DUMP_CONVERTERS: dict[str, Callable[[Any, type], bytes]] = {
+        "json": _dump_json,
+        "yml": _dump_yaml,
+        "csv": _dump_csv,
+    }
 
     def _enable_files_in_repos(self):
         """The `_enable_files_in_repos` method is a private method that is used to enable the "Files In Repos"
         feature on the current workspace. This method is called by the `upload` method."""
+        if self._fs_enabled:
+            # already confirmed (or flipped) on this instance: skip the
+            # workspace-conf round-trip on every subsequent failed upload
+            return
         workspace_file_system = self._ws.workspace_conf.get_status("enableWorkspaceFilesystem")
 
         logger.debug("Checking Files In Repos configuration")
@@ -827,6 +1201,7 @@ class Installation:
         if workspace_file_system["enableWorkspaceFilesystem"] == "false":
             logger.debug("enableWorkspaceFilesystem is False, enabling the config")
             self._ws.workspace_conf.set_status({"enableWorkspaceFilesystem": "true"})
+        self._fs_enabled = True
 
 
 class MockInstallation(Installation):
@@ -841,10 +1216,12 @@ class MockInstallation(Installation):
         if not overwrites:
             overwrites = {}
         self._overwrites = overwrites
-        self._uploads: dict[str, bytes] = {}
-        self._dbfs: dict[str, bytes] = {}
+        self._uploads: dict[str, tempfile.SpooledTemporaryFile] = {}
+        self._dbfs: dict[str, tempfile.SpooledTemporaryFile] = {}
         self._removed = False
         self._is_global = is_global
+        self._missing: set[str] = set()
+        self._load_cache: dict[tuple[str, Any], tuple[Any, Any]] = {}
 
     def install_folder(self) -> str:
         return "~/mock"
@@ -859,13 +1236,35 @@ class MockInstallation(Installation):
         return "https://localhost"
 
     def upload(self, filename: str, raw: bytes):
-        self._uploads[filename] = raw
+        self._store_spool(self._uploads, filename, raw)
         return f"{self.install_folder()}/{filename}"
 
     def upload_dbfs(self, filename: str, raw: BinaryIO) -> str:
-        self._dbfs[filename] = raw.read()
+        self._store_spool(self._dbfs, filename, raw.read())
         return f"{self.install_folder()}/{filename}"
 
+    def close(self):
+        """Releases the spooled upload buffers; re-uploading after close is fine."""
+        for store in (self._uploads, self._dbfs):
+            for spooled in store.values():
+                spooled.close()
+            store.clear()
+
+    def __del__(self):
+        self.close()
+
+    @staticmethod
+    def _store_spool(store: dict[str, tempfile.SpooledTemporaryFile], filename: str, raw: bytes):
+        """Payloads over 1 MiB spill to a temporary file, so test suites with many
+        large uploads don't keep every blob in memory until teardown."""
+        # the store owns the handle: close() (or overwriting the same name) releases it
+        spooled = tempfile.SpooledTemporaryFile(max_size=1 << 20)  # pylint: disable=consider-using-with
+        spooled.write(raw)
+        previous = store.get(filename)
+        if previous is not None:
+            previous.close()
+        store[filename] = spooled
+
     def files(self) -> list[workspace.ObjectInfo]:
         out = []
         for filename in self._overwrites.keys():
@@ -890,6 +1289,10 @@ class MockInstallation(Installation):
     def _current_client_config(self) -> dict:
         return {}
 
+    def _modified_at(self, filename: str):
+        # overwrites are plain dicts mutated in place, so never serve a cached copy
+        return None
+
     def _overwrite_content(self, filename: str, as_dict: Json, type_ref: type):
         self._overwrites[filename] = as_dict
 
@@ -919,15 +1322,20 @@ class MockInstallation(Installation):
         assert self._removed
 
     @staticmethod
-    def _assert_upload(filename: Any, loc: dict[str, bytes], expected: bytes | None = None):
+    def _assert_upload(filename: Any, loc: dict[str, tempfile.SpooledTemporaryFile], expected: bytes | None = None):
+        def content(name: str) -> bytes:
+            spooled = loc[name]
+            spooled.seek(0)
+            return spooled.read()
+
         if isinstance(filename, re.Pattern):
-            for name in loc.keys():
-                if not filename.match(name):
-                    continue
-                if expected:
-                    assert loc[name] == expected, f"{filename} content missmatch"
-                return
-            raise AssertionError(f'Cannot find {filename.pattern} among {", ".join(loc.keys())}')
+            # filter() drives the scan in C instead of a Python-level loop
+            name = next(filter(filename.match, loc), None)
+            if name is None:
+                raise AssertionError(f'Cannot find {filename.pattern} among {", ".join(loc.keys())}')
+            if expected:
+                assert content(name) == expected, f"{filename} content missmatch"
+            return
         assert filename in loc, f"{filename} had no writes"
         if expected:
-            assert loc[filename] == expected, f"{filename} content missmatch"
+            assert content(filename) == expected, f"{filename} content missmatch"
@@ -1,3 +1,4 @@
+import functools
 import inspect
 import json
 import sys
@@ -44,6 +45,62 @@ def test_commands():
     some.assert_called_with("y", 100, 100.5, True, "default", "optional")
 
 
+def test_commands_with_deferred_annotations():
+    some = mock.Mock()
+    app = App(inspect.getfile(App))
+
+    # string annotations are what `from __future__ import annotations` stores
+    @app.command(is_unauthenticated=True)
+    def foo(
+        name: "str",
+        age: "int",
+        salary: "float",
+        is_customer: "bool",
+        address: "str" = "default",
+        optional_arg: "str | None" = None,
+    ):
+        """Some comment"""
+        some(name, age, salary, is_customer, address, optional_arg)
+
+    with mock.patch.object(sys, "argv", [..., FOO_COMMAND]):
+        app()
+
+    some.assert_called_with("y", 100, 100.5, True, "default", "optional")
+
+
+def test_commands_with_decorated_handler():
+    some = mock.Mock()
+    client = mock.Mock()
+    app = App(inspect.getfile(App))
+
+    def audited(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    @app.command
+    @audited
+    def foo(
+        w,
+        name: str,
+        age: int,
+        salary: float,
+        is_customer: bool,
+        address: str = "default",
+        optional_arg: str | None = None,
+    ):
+        """Some comment"""
+        some(w, name, age, salary, is_customer, address, optional_arg)
+
+    with mock.patch.object(App, "_workspace_client", return_value=client):
+        with mock.patch.object(sys, "argv", [..., FOO_COMMAND]):
+            app()
+
+    some.assert_called_with(client, "y", 100, 100.5, True, "default", "optional")
+
+
 def test_injects_prompts():
     some = mock.Mock()
     app = App(inspect.getfile(App))
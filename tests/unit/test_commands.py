@@ -31,6 +31,24 @@ def test_parse_results_data_as_json_with_json_print_and_return():
         _ReturnToPrintJson.transform("\n".join(["print(1)", "return 1"]))
 
 
+def test_parse_results_data_as_json_with_tuple_return():
+    out, has_return = _ReturnToPrintJson.transform("return 1, 2")
+    assert out.splitlines() == ["import json", "print(json.dumps((1, 2)))"]
+    assert has_return
+
+
+def test_parse_results_data_as_json_with_trailing_comment():
+    out, has_return = _ReturnToPrintJson.transform("\n".join(["x = 1", "return x  # comment"]))
+    assert out.splitlines() == ["import json", "x = 1", "print(json.dumps(x))"]
+    assert has_return
+
+
+def test_parse_results_data_as_json_with_jsonschema_import():
+    out, has_return = _ReturnToPrintJson.transform("\n".join(["import jsonschema", "return 1"]))
+    assert out.splitlines() == ["import json", "import jsonschema", "print(json.dumps(1))"]
+    assert has_return
+
+
 def test_fails_execution():
     clusters_ext = create_autospec(ClustersExt)
     command_execution = create_autospec(compute.CommandExecutionAPI)
@@ -7,10 +7,10 @@ import pytest
 import yaml
 from databricks.sdk import WorkspaceClient
 from databricks.sdk.core import Config
-from databricks.sdk.errors import NotFound
+from databricks.sdk.errors import NotFound, PermissionDenied
 from databricks.sdk.service import iam
 from databricks.sdk.service.provisioning import Workspace
-from databricks.sdk.service.workspace import ImportFormat
+from databricks.sdk.service.workspace import ImportFormat, ObjectInfo
 
 from databricks.labs.blueprint.installation import (
     IllegalState,
@@ -57,7 +57,7 @@ def test_current_found_root():
 
 def test_existing_not_found():
     ws = create_autospec(WorkspaceClient)
-    ws.users.list.return_value = [iam.User(user_name="foo")]
+    ws.workspace.list.return_value = [ObjectInfo(path="/Users/foo")]
     ws.workspace.get_status.side_effect = NotFound(...)
 
     existing = Installation.existing(ws, "blueprint")
@@ -68,6 +68,18 @@ def test_existing_not_found():
     assert 2 == ws.workspace.get_status.call_count
 
 
+def test_existing_falls_back_to_scim():
+    ws = create_autospec(WorkspaceClient)
+    ws.workspace.list.side_effect = PermissionDenied(...)
+    ws.users.list.return_value = [iam.User(user_name="foo")]
+    ws.workspace.get_status.side_effect = NotFound(...)
+
+    existing = Installation.existing(ws, "blueprint")
+    assert [] == existing
+
+    ws.workspace.get_status.assert_any_call("/Users/foo/.blueprint")
+
+
 def test_existing_found_root():
     ws = create_autospec(WorkspaceClient)
     ws.workspace.get_status.side_effect = None
@@ -121,6 +133,32 @@ def test_save_typed_file():
     )
 
 
+def test_save_many():
+    ws = create_autospec(WorkspaceClient)
+    ws.current_user.me().user_name = "foo"
+    installation = Installation(ws, "blueprint")
+
+    targets = installation.save_many(
+        [
+            WorkspaceConfig(inventory_database="first_blueprint"),
+            WorkspaceConfig(inventory_database="second_blueprint"),
+        ],
+        filenames=["first.yml", "second.yml"],
+    )
+
+    assert ["/Users/foo/.blueprint/first.yml", "/Users/foo/.blueprint/second.yml"] == targets
+    assert ws.workspace.upload.call_count == 2
+
+
+def test_save_many_requires_matching_filenames():
+    ws = create_autospec(WorkspaceClient)
+    ws.current_user.me().user_name = "foo"
+    installation = Installation(ws, "blueprint")
+
+    with pytest.raises(ValueError):
+        installation.save_many([WorkspaceConfig(inventory_database="some_blueprint")], filenames=[])
+
+
 def test_creates_missing_folders():
     ws = create_autospec(WorkspaceClient)
     ws.current_user.me().user_name = "foo"
@@ -210,6 +248,38 @@ def test_load_csv_file():
     assert 1235 == workspaces[1].workspace_id
 
 
+@dataclass
+class FirstShape:
+    first: str
+
+
+@dataclass
+class SecondShape:
+    second: str | None = None
+
+
+def test_load_cache_validated_by_modified_at():
+    ws = create_autospec(WorkspaceClient)
+    ws.current_user.me().user_name = "foo"
+    ws.workspace.get_status.return_value = ObjectInfo(modified_at=100)
+    ws.workspace.download.side_effect = lambda _: io.BytesIO(b'{"first": "a", "second": "b"}')
+    installation = Installation(ws, "blueprint")
+
+    first = installation.load(FirstShape, filename="shape.json")
+    assert installation.load(FirstShape, filename="shape.json") is first
+    assert 1 == ws.workspace.download.call_count
+
+    # the same filename loaded as another type must not reuse the cached instance
+    second = installation.load(SecondShape, filename="shape.json")
+    assert SecondShape("b") == second
+    assert 2 == ws.workspace.download.call_count
+
+    # a newer modification timestamp invalidates the cached instance
+    ws.workspace.get_status.return_value = ObjectInfo(modified_at=101)
+    assert installation.load(FirstShape, filename="shape.json") is not first
+    assert 3 == ws.workspace.download.call_count
+
+
 @pytest.mark.parametrize("ext", ["json", "csv"])
 def test_load_typed_list_file(ext):
     installation = MockInstallation(
@@ -341,7 +411,12 @@ def test_enable_files_in_repos():
     installation._enable_files_in_repos()
     ws.workspace_conf.set_status.assert_not_called()
 
+    # once confirmed, the instance no longer re-queries the workspace conf
+    installation._enable_files_in_repos()
+    ws.workspace_conf.get_status.assert_called_once()
+
     # enableWorkspaceFilesystem is false
+    installation = Installation(ws, "ucx")
     ws.workspace_conf.get_status.return_value = {"enableWorkspaceFilesystem": "false"}
     installation._enable_files_in_repos()
     ws.workspace_conf.set_status.assert_called_once()
@@ -447,6 +522,27 @@ def test_load_empty_data_class():
     assert load == complex_class
 
 
+@dataclass
+class Node:
+    name: str
+    children: list["Node"] | None = None
+
+
+def test_load_self_referential_data_class():
+    installation = MockInstallation()
+    tree = Node("root", children=[Node("left"), Node("right", children=[Node("leaf")])])
+    installation.save(tree, filename="backups/node.json")
+    installation.assert_file_written(
+        "backups/node.json",
+        {
+            "name": "root",
+            "children": [{"name": "left"}, {"name": "right", "children": [{"name": "leaf"}]}],
+        },
+    )
+    load = installation.load(Node, filename="backups/node.json")
+    assert load == tree
+
+
 def test_assert_file_uploaded():
     installation = MockInstallation()
     installation.upload("foo", b"bar")